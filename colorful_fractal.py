@@ -4,16 +4,19 @@
 
 此脚本生成各种经典分形图案，带有丰富多彩的设计
 使用Python turtle模块。
+
+传入文件名时不打开窗口，直接把Koch雪花保存为PNG（需要 Pillow）：
+
+    python colorful_fractal.py koch.png
 """
 
+import sys
 import turtle
 import random
 from math import cos, sin, radians
-import colorsys
+from functools import lru_cache
 
-# Global counters for color gradient
-SEG_IDX = 0  # 当前绘制到的线段序号
-TOTAL_SEGMENTS = 1  # 总线段数，将在绘制开始前设置
+import numpy as np
 
 # Set up the screen
 def setup_screen():
@@ -34,6 +37,9 @@ def create_turtle():
     t.pensize(3)  # Slightly thicker lines for better visibility
     return t
 
+# 直接画到Tk画布上的分形图形都带有这个标签，可用 canvas.delete(FRACTAL_TAG) 清除
+FRACTAL_TAG = "fractal"
+
 # 固定的彩虹颜色列表
 RAINBOW_COLORS = [
     "#FF0000",  # 红色
@@ -69,84 +75,166 @@ def random_bright_color():
     b = random.randint(150, 255)
     return f"#{r:02x}{g:02x}{b:02x}"
 
-# Koch雪花分形 - 彩色变体
-def koch_snowflake(t, length, level, max_level):
-    if level == 0:
-        # 在最底层段落设置颜色并绘制
-        global SEG_IDX, TOTAL_SEGMENTS
-        h = SEG_IDX / TOTAL_SEGMENTS
-        r, g, b = colorsys.hsv_to_rgb(h, 1.0, 1.0)
-        t.pencolor(int(r * 255), int(g * 255), int(b * 255))
-        SEG_IDX += 1
-        t.forward(length)
-    else:
-        koch_snowflake(t, length/3, level-1, max_level)
-        t.left(60)
-        koch_snowflake(t, length/3, level-1, max_level)
-        t.right(120)
-        koch_snowflake(t, length/3, level-1, max_level)
-        t.left(60)
-        koch_snowflake(t, length/3, level-1, max_level)
+# Koch雪花的L系统：F 前进一段，L 左转60度，R 右转60度
+KOCH_F, KOCH_L, KOCH_R = 0, 1, 2
+KOCH_AXIOM = np.array([KOCH_F, KOCH_R, KOCH_R, KOCH_F, KOCH_R, KOCH_R, KOCH_F],
+                      dtype=np.int8)  # F--F--F，顺时针绘制三条边
+# 每行是一个符号的替换结果，-1 为填充位：F -> F+F--F+F，L、R 保持不变
+KOCH_RULES = np.array([
+    [KOCH_F, KOCH_L, KOCH_F, KOCH_R, KOCH_R, KOCH_F, KOCH_L, KOCH_F],
+    [KOCH_L, -1, -1, -1, -1, -1, -1, -1],
+    [KOCH_R, -1, -1, -1, -1, -1, -1, -1],
+], dtype=np.int8)
+KOCH_TURNS = np.array([0, 60, -60], dtype=np.int16)  # 每个符号对应的转角
+KOCH_COLOR_BUCKETS = 32  # 渐变色的量化级数，也是绘制一个雪花最多的 create_line 调用次数
+
+# 迭代展开L系统，得到Koch曲线的符号序列（不使用递归）
+def expand_koch(axiom, levels):
+    tokens = np.asarray(axiom, dtype=np.int8)
+    for _ in range(levels):
+        expanded = KOCH_RULES[tokens].ravel()
+        tokens = expanded[expanded >= 0]
+    return tokens
+
+# 完整Koch雪花（三条边）的符号序列
+def koch_snowflake_tokens(levels):
+    return expand_koch(KOCH_AXIOM, levels)
+
+# 向量化的 HSV(h, 1, 1) -> RGB 转换，结果与 colorsys.hsv_to_rgb 逐点一致
+def hsv_to_rgb_array(h):
+    """返回形状为 (N, 3) 的 uint8 数组，每行是一个 0-255 的 RGB 颜色"""
+    h6 = (np.asarray(h, dtype=float) % 1.0) * 6.0
+    sector = h6.astype(int) % 6  # 色相所在的六个扇区之一
+    f = h6 - h6.astype(int)
+    q = 1.0 - f
+    choices = [sector == i for i in range(5)]
+    r = np.select(choices, [1.0, q, 0.0, 0.0, f], default=1.0)
+    g = np.select(choices, [f, 1.0, 1.0, q, 0.0], default=0.0)
+    b = np.select(choices, [0.0, 0.0, f, 1.0, 1.0], default=q)
+    return (np.stack([r, g, b], axis=1) * 255).astype(np.uint8)
+
+# 预先计算的渐变色表：第 i 项是色相 i/n 对应的十六进制颜色
+@lru_cache(maxsize=None)
+def hsv_hex_lut(n):
+    rgb = hsv_to_rgb_array(np.arange(n) / n)
+    return tuple(f"#{r:02x}{g:02x}{b:02x}" for r, g, b in rgb)
+
+# 计算完整Koch雪花的几何数据，供Tk画布和PNG输出共用
+def koch_snowflake_polylines(x0, y0, heading, size, levels):
+    """返回 [(顶点数组, 颜色), ...]，每项是一个色段的折线（海龟坐标系）"""
+    tokens = koch_snowflake_tokens(levels)
+    steps = tokens == KOCH_F
+    total_segments = int(steps.sum())  # 3 * 4**levels
+    seg_len = size / 3 ** levels
+
+    # 每一步前进时的朝向 = 初始朝向 + 之前所有转角之和
+    theta = np.radians(heading + np.cumsum(KOCH_TURNS[tokens], dtype=np.int32)[steps])
+    xs = x0 + np.concatenate([[0.0], np.cumsum(seg_len * np.cos(theta))])
+    ys = y0 + np.concatenate([[0.0], np.cumsum(seg_len * np.sin(theta))])
+    points = np.column_stack([xs, ys])
+
+    # 渐变色量化为若干色段；色相随线段序号单调递增，同一色段的线段首尾相连
+    bucket = np.arange(total_segments) * KOCH_COLOR_BUCKETS // total_segments
+    bounds = np.flatnonzero(np.diff(bucket)) + 1
+    starts = np.concatenate([[0], bounds])
+    ends = np.concatenate([bounds, [total_segments]])
+    colors = hsv_hex_lut(KOCH_COLOR_BUCKETS)
+    return [(points[start:end + 1], colors[bucket[start]])
+            for start, end in zip(starts, ends)]
 
 # 绘制完整的Koch雪花
-def draw_koch_snowflake(t, size, levels):
-    global SEG_IDX, TOTAL_SEGMENTS
-    SEG_IDX = 0
-    TOTAL_SEGMENTS = 3 * (4 ** levels)  # 递归后总线段数
-    # 为三个边设置不同的起始颜色
-    for _ in range(3):
-        
-        koch_snowflake(t, size, levels, levels)
-        t.right(120)
+def draw_koch_snowflake(t, size, levels, canvas=None):
+    """从海龟当前位置和朝向出发，一次性算出所有顶点并直接批量画到Tk画布上
+
+    canvas 为海龟屏幕的Tk画布，多次绘制时可由调用方缓存后传入
+
+    这里不为固定层级生成展开的绘制代码：顶点已由NumPy一次算出，并按色段
+    批量提交，不再有逐段的Python分派或海龟调用可供特化
+    """
+    if canvas is None:
+        canvas = t.screen.getcanvas()
+    width = t.pensize()
+    x0, y0 = t.position()
+    # Tk画布的Y轴朝下，因此Y坐标取反；每个色段只调用一次 create_line
+    for points, color in koch_snowflake_polylines(x0, y0, t.heading(), size, levels):
+        coords = points * [1.0, -1.0]
+        canvas.create_line(*coords.ravel().tolist(), fill=color, width=width,
+                           capstyle="round", tags=FRACTAL_TAG)
+
+# 不经过Tk，直接把Koch雪花渲染成PNG文件（适合无显示环境批量生成图片）
+def render_koch_png(path, size=600, levels=4, start=(-300, 100),
+                    width=800, height=800, pensize=3):
+    """与 main() 中的画面一致：黑色背景，雪花从 start 处开始绘制；需要 Pillow"""
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", (width, height), "black")
+    draw = ImageDraw.Draw(image)
+    # 海龟坐标原点在画面中心、Y轴朝上，换算成图片的像素坐标
+    for points, color in koch_snowflake_polylines(start[0], start[1], 0, size, levels):
+        pixels = np.column_stack([points[:, 0] + width / 2, height / 2 - points[:, 1]])
+        draw.line([tuple(p) for p in pixels.tolist()], fill=color, width=pensize,
+                  joint="curve")
+    image.save(path)
 
 # 谢尔宾斯基三角形分形 - 带颜色
-def sierpinski_triangle(t, points, level, max_level):
-    # 绘制填充三角形
-    t.penup()
-    t.goto(points[0][0], points[0][1])
-    t.pendown()
-    
-    # 根据级别选择颜色
-    color = RAINBOW_COLORS[level % len(RAINBOW_COLORS)]
-    t.fillcolor(color)
-    t.pencolor(color)
-    t.begin_fill()
-    
-    for x, y in points[1:] + [points[0]]:
-        t.goto(x, y)
-    
-    t.end_fill()
-    
-    # 如果级别 > 0，绘制三个更小的三角形
-    if level > 0:
-        # 计算中点
-        mid1 = ((points[0][0] + points[1][0]) / 2, (points[0][1] + points[1][1]) / 2)
-        mid2 = ((points[1][0] + points[2][0]) / 2, (points[1][1] + points[2][1]) / 2)
-        mid3 = ((points[2][0] + points[0][0]) / 2, (points[2][1] + points[0][1]) / 2)
-        
-        # 对三个更小的三角形递归调用
-        sierpinski_triangle(t, [points[0], mid1, mid3], level-1, max_level)
-        sierpinski_triangle(t, [mid1, points[1], mid2], level-1, max_level)
-        sierpinski_triangle(t, [mid3, mid2, points[2]], level-1, max_level)
+def sierpinski_triangle(t, points, level, max_level, canvas=None):
+    """逐层细分三角形（不使用递归），每层的所有三角形一起画到Tk画布上
+
+    与逐个填充的海龟版本相同，先画大三角形，再用下一层的小三角形覆盖
+    """
+    if canvas is None:
+        canvas = t.screen.getcanvas()
+    width = t.pensize()
+    tris = np.array([points], dtype=float)  # 形状为 (三角形数, 3, 2)
+    flip = np.array([1.0, -1.0] * 3)  # Tk画布的Y轴朝下
+
+    for lv in range(level, -1, -1):
+        # 同一层的三角形颜色相同：先用临时标签创建，再对整层统一设置一次样式
+        for coords in (tris.reshape(-1, 6) * flip).tolist():
+            canvas.create_polygon(*coords, tags=(FRACTAL_TAG, "sierpinski-level"))
+        color = RAINBOW_COLORS[lv % len(RAINBOW_COLORS)]
+        canvas.itemconfigure("sierpinski-level", fill=color, outline=color, width=width)
+        canvas.dtag("sierpinski-level")
+
+        if lv > 0:
+            # 计算中点，每个三角形分成三个更小的三角形
+            p0, p1, p2 = tris[:, 0], tris[:, 1], tris[:, 2]
+            mid1 = (p0 + p1) / 2
+            mid2 = (p1 + p2) / 2
+            mid3 = (p2 + p0) / 2
+            tris = np.concatenate([
+                np.stack([p0, mid1, mid3], axis=1),
+                np.stack([mid1, p1, mid2], axis=1),
+                np.stack([mid3, mid2, p2], axis=1),
+            ])
 
 # 龙曲线分形
-def dragon_curve(t, length, level, angle, max_level):
-    # 根据级别设置颜色
-    color = RAINBOW_COLORS[level % len(RAINBOW_COLORS)]
-    t.pencolor(color)
-    
-    if level == 0:
-        t.forward(length)
-    else:
-        t.right(angle)
-        dragon_curve(t, length, level-1, -angle, max_level)
-        t.left(angle * 2)
-        dragon_curve(t, length, level-1, angle, max_level)
-        t.right(angle)
+def dragon_curve(t, length, level, angle, max_level, canvas=None):
+    """从海龟当前位置和朝向出发，用位运算一次算出所有线段的朝向（不使用递归）
+
+    递归版本里第 k 段的朝向由 k 的二进制位决定：从最高位起，每一位为0时
+    转角取反，为1时保持，朝向就是这些逐位累积的转角之和
+    """
+    if canvas is None:
+        canvas = t.screen.getcanvas()
+    k = np.arange(2 ** level)
+    bits = (k[:, None] >> np.arange(level - 1, -1, -1)) & 1  # 每行从最高位开始
+    signs = np.cumprod(2 * bits - 1, axis=1)
+    theta = np.radians(t.heading() + angle * signs.sum(axis=1))
+
+    x0, y0 = t.position()
+    xs = x0 + np.concatenate([[0.0], np.cumsum(length * np.cos(theta))])
+    ys = y0 + np.concatenate([[0.0], np.cumsum(length * np.sin(theta))])
+
+    # 每一段都在第0层设置颜色后绘制，所以整条曲线是同一种颜色，一条折线即可
+    points = np.column_stack([xs, -ys])  # Tk画布的Y轴朝下
+    canvas.create_line(*points.ravel().tolist(), fill=RAINBOW_COLORS[0],
+                       width=t.pensize(), capstyle="round", tags=FRACTAL_TAG)
 
 # Main function to select and draw fractals
 def main():
     screen = setup_screen()
+    canvas = screen.getcanvas()  # 批量绘制直接使用Tk画布，只获取一次
     t = create_turtle()
     
     # 创建多彩的分形图案 - 彩色Koch雪花
@@ -156,29 +244,33 @@ def main():
     
     # 增加层级以使分形效果更明显
     levels = 4  # 保持在4层，但确保颜色清晰可见
-    draw_koch_snowflake(t, 600, levels)  # 大小, 层级
+    draw_koch_snowflake(t, 600, levels, canvas)  # 大小, 层级, 画布
     
     # 如果你想尝试其他分形，取消下面的注释
     
     # 选项2: 谢尔宾斯基三角形
-    # t.clear()  # 清除之前的图案
+    # canvas.delete(FRACTAL_TAG)  # 清除之前的图案（直接画在画布上，t.clear() 清不掉）
     # size = 350
     # points = [
     #     (-size, -size * 0.866),  # 左下角
     #     (size, -size * 0.866),    # 右下角
     #     (0, size * 0.866)         # 顶部
     # ]
-    # sierpinski_triangle(t, points, 6, 6)  # 顶点, 层级, 最大层级
+    # sierpinski_triangle(t, points, 6, 6, canvas)  # 顶点, 层级, 最大层级, 画布
     
     # 选项3: 龙曲线
-    # t.clear()  # 清除之前的图案
+    # canvas.delete(FRACTAL_TAG)  # 清除之前的图案（直接画在画布上，t.clear() 清不掉）
     # t.penup()
     # t.goto(-100, 0)
     # t.pendown()
-    # dragon_curve(t, 8, 12, 45, 12)  # 长度, 层级, 角度, 最大层级
+    # dragon_curve(t, 8, 12, 45, 12, canvas)  # 长度, 层级, 角度, 最大层级, 画布
     
     screen.update()
     turtle.done()
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1:
+        # 传入文件名时不打开窗口，直接输出PNG，例如: python colorful_fractal.py koch.png
+        render_koch_png(sys.argv[1])
+    else:
+        main()
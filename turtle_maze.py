@@ -22,19 +22,154 @@ Run this file directly to see a demo::
 
     python turtle_maze_generator.py
 
+Pass a file name to skip the window and save the maze as a PNG instead
+(requires Pillow)::
+
+    python turtle_maze.py maze.png
+
 Press the turtle window’s *close* button or hit ⌘-Q/ALT-F4 to quit.
 """
 from __future__ import annotations
 
 import random
+import sys
+import tkinter
 import turtle
-from collections import deque
-from typing import Dict, List, Tuple
+from typing import Tuple
+
+import numpy as np
+
+try:  # Numba is optional: without it everything runs as plain Python
+    from numba import njit
+except ImportError:  # pragma: no cover - depends on the environment
+    njit = None
 
-# Wall identifiers used inside each cell dictionary
-N, S, E, W = "N", "S", "E", "W"
-OPPOSITE = {N: S, S: N, E: W, W: E}
-DIR_VEC = {N: (-1, 0), S: (1, 0), E: (0, 1), W: (0, -1)}  # row, col diffs
+# Wall bits stored in each cell of the ``walls`` array
+N_BIT, S_BIT, E_BIT, W_BIT = 1, 2, 4, 8
+ALL_WALLS = N_BIT | S_BIT | E_BIT | W_BIT
+
+# Wall bit and opposite wall bit per direction, in N, S, E, W order, for the kernels
+_BITS = np.array([N_BIT, S_BIT, E_BIT, W_BIT], dtype=np.uint8)
+_OPP_BITS = np.array([S_BIT, N_BIT, W_BIT, E_BIT], dtype=np.uint8)
+
+
+# -------------------------------------------------------------------------
+#  COMPILED KERNELS (NUMBA)
+# -------------------------------------------------------------------------
+def _carve_nb(walls, sr, sc, complexity):
+    """Carve passages into *walls* in place (recursive back-tracker).
+
+    Like :func:`_bfs_nb`, cells are addressed by their flat index
+    ``r * cols + c``: *visited* is a flat boolean array and the stack holds
+    packed indices. The stack (with pointer ``sp``) and the buffer of
+    candidate directions are allocated once up front, so the loop itself
+    allocates nothing.
+    """
+    rows, cols = walls.shape
+    flat = walls.reshape(rows * cols)  # view: writes go straight to *walls*
+    visited = np.zeros(rows * cols, dtype=np.bool_)
+    stack = np.empty(rows * cols, dtype=np.int32)
+    offsets = np.array([-cols, cols, 1, -1])  # flat index step per direction
+    candidates = np.empty(4, dtype=np.int64)  # direction indices into _BITS
+    idx = sr * cols + sc
+    stack[0] = idx
+    sp = 1
+    visited[idx] = True
+
+    while sp > 0:
+        idx = stack[sp - 1]  # current cell, not popped yet
+        r, c = idx // cols, idx % cols
+        # Unvisited neighbours, in N, S, E, W order
+        count = 0
+        if r > 0 and not visited[idx - cols]:
+            candidates[count] = 0
+            count += 1
+        if r < rows - 1 and not visited[idx + cols]:
+            candidates[count] = 1
+            count += 1
+        if c < cols - 1 and not visited[idx + 1]:
+            candidates[count] = 2
+            count += 1
+        if c > 0 and not visited[idx - 1]:
+            candidates[count] = 3
+            count += 1
+
+        if count > 0:
+            # Bias: with high *complexity* pick random neighbour, otherwise take first
+            if random.random() < complexity:
+                d = candidates[random.randrange(count)]
+            else:
+                d = candidates[0]
+            nidx = idx + offsets[d]
+            # Knock down the shared wall
+            flat[idx] &= ALL_WALLS ^ _BITS[d]
+            flat[nidx] &= ALL_WALLS ^ _OPP_BITS[d]
+            visited[nidx] = True
+            stack[sp] = nidx
+            sp += 1
+        else:
+            sp -= 1  # no unvisited neighbours, backtrack
+
+
+def _bfs_nb(walls, sr, sc):
+    """Return ``(r, c)`` of a cell farthest from ``(sr, sc)`` along open passages.
+
+    Cells are addressed by their flat index ``r * cols + c``; *dist* and the
+    queue are 1-D arrays of that size. Every cell is enqueued at most once,
+    so the queue never wraps and the last cell popped is on the deepest level.
+
+    A queue-less NumPy wavefront (propagating a frontier mask through the
+    open walls one level at a time) is *not* used: a perfect maze is a tree
+    whose depth grows with its area, so the frontier stays a few cells wide
+    while each level still costs several whole-array passes.
+    """
+    rows, cols = walls.shape
+    flat = walls.reshape(rows * cols)
+    dist = np.full(rows * cols, -1, dtype=np.int32)
+    queue = np.empty(rows * cols, dtype=np.int32)
+    idx = sr * cols + sc
+    queue[0] = idx
+    dist[idx] = 0
+    head, tail = 0, 1
+
+    while head < tail:
+        idx = queue[head]
+        head += 1
+        w = flat[idx]
+        if not w & N_BIT and dist[idx - cols] == -1:
+            dist[idx - cols] = dist[idx] + 1
+            queue[tail] = idx - cols
+            tail += 1
+        if not w & S_BIT and dist[idx + cols] == -1:
+            dist[idx + cols] = dist[idx] + 1
+            queue[tail] = idx + cols
+            tail += 1
+        if not w & E_BIT and dist[idx + 1] == -1:
+            dist[idx + 1] = dist[idx] + 1
+            queue[tail] = idx + 1
+            tail += 1
+        if not w & W_BIT and dist[idx - 1] == -1:
+            dist[idx - 1] = dist[idx] + 1
+            queue[tail] = idx - 1
+            tail += 1
+    return idx // cols, idx % cols
+
+
+def _seed_nb(seed):
+    """Seed the RNG the compiled kernels draw from."""
+    random.seed(seed)
+
+
+if njit is not None:
+    # cache=True keeps the compiled code on disk, so only the first run pays
+    # for the JIT.
+    _carve_nb = njit(cache=True)(_carve_nb)
+    _bfs_nb = njit(cache=True)(_bfs_nb)
+    _seed_nb = njit(cache=True)(_seed_nb)
+
+# Compiled kernels draw from Numba's own RNG, separate from `random`. As plain
+# Python (no Numba, or NUMBA_DISABLE_JIT=1) they use the caller's stream.
+_JIT = hasattr(_carve_nb, "py_func")
 
 
 class MazeGenerator:
@@ -61,85 +196,42 @@ class MazeGenerator:
         self.complexity = complexity
         self.difficulty = difficulty
 
-        # Grid initialisation. Every cell starts with all four walls intact.
-        self.grid: List[List[Dict[str, bool]]] = [
-            [{N: True, S: True, E: True, W: True} for _ in range(cols)]
-            for _ in range(rows)
-        ]
+        # Wall bitmask per cell (N/S/E/W bits). Every cell starts with all
+        # four walls intact.
+        self.walls: np.ndarray = np.full((rows, cols), ALL_WALLS, dtype=np.uint8)
 
         # Public attributes describing entrance/exit once generated
         self.start: Tuple[int, int] | None = None
         self.end: Tuple[int, int] | None = None
 
+        # Tk canvas of the turtle screen, looked up on the first draw()
+        self._canvas = None
+        self._wall_image = None  # PhotoImage of the walls, kept alive here
+
     # ---------------------------------------------------------------------
     #  MAZE GENERATION (RECURSIVE BACK-TRACKER)
     # ---------------------------------------------------------------------
-    def _unvisited_neighbours(self, r: int, c: int, visited: List[List[bool]]):
-        """Return list of (nr, nc, dir_from_current, dir_from_neighbour)."""
-        neighbours = []
-        for direction, (dr, dc) in DIR_VEC.items():
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < self.rows and 0 <= nc < self.cols and not visited[nr][nc]:
-                neighbours.append((nr, nc, direction, OPPOSITE[direction]))
-        # *complexity* controls how much we shuffle: more shuffle ⇒ twistier.
-        shuffle_portion = int(len(neighbours) * self.complexity)
-        random.shuffle(neighbours[:shuffle_portion])
-        return neighbours
-
     def _carve_passage(self, start_r: int, start_c: int) -> None:
-        """Iterative version of the maze carving algorithm using an explicit stack"""
-        visited = [[False] * self.cols for _ in range(self.rows)]
-        stack = [(start_r, start_c)]
-        visited[start_r][start_c] = True
-        
-        while stack:
-            r, c = stack[-1]  # Get current cell, but don't pop yet
-            
-            neighbours = self._unvisited_neighbours(r, c, visited)
-            if neighbours:
-                # Bias: with high *complexity* pick random neighbour, otherwise take first
-                nr, nc, here_dir, there_dir = (
-                    random.choice(neighbours) if random.random() < self.complexity else neighbours[0]
-                )
-                # Knock down the shared wall
-                self.grid[r][c][here_dir] = False
-                self.grid[nr][nc][there_dir] = False
-                # Mark as visited and add to stack
-                visited[nr][nc] = True
-                stack.append((nr, nc))
-            else:
-                # No unvisited neighbors, backtrack
-                stack.pop()
+        """Iterative version of the maze carving algorithm using an explicit stack
+
+        Compiled, the kernel's RNG is seeded from `random`, so `random.seed()`
+        still makes mazes reproducible. Numba's generator does not produce
+        the same sequence as CPython's for a given seed, though, so builds
+        with and without Numba carve different mazes for the same
+        `random.seed()`.
+        """
+        if _JIT:
+            _seed_nb(random.getrandbits(32))
+        _carve_nb(self.walls, start_r, start_c, self.complexity)
 
     def _longest_path_endpoints(self) -> Tuple[Tuple[int, int], Tuple[int, int]]:
         """Return approximate diameter endpoints of the tree via double-BFS."""
-
-        def bfs(start: Tuple[int, int]):
-            sr, sc = start
-            dist = [[-1] * self.cols for _ in range(self.rows)]
-            dist[sr][sc] = 0
-            q = deque([start])
-            parent: Dict[Tuple[int, int], Tuple[int, int]] = {}
-            farthest = start
-            while q:
-                r, c = q.popleft()
-                farthest = max(farthest, (r, c), key=lambda rc: dist[rc[0]][rc[1]])
-                for direction, (dr, dc) in DIR_VEC.items():
-                    if self.grid[r][c][direction]:
-                        continue  # wall in that direction
-                    nr, nc = r + dr, c + dc
-                    if dist[nr][nc] == -1:
-                        dist[nr][nc] = dist[r][c] + 1
-                        parent[(nr, nc)] = (r, c)
-                        q.append((nr, nc))
-            return farthest, dist, parent
-
-        end_a, *_ = bfs((0, 0))
-        end_b, *_ = bfs(end_a)
-        return end_a, end_b
+        end_a = _bfs_nb(self.walls, 0, 0)
+        end_b = _bfs_nb(self.walls, *end_a)
+        return (int(end_a[0]), int(end_a[1])), (int(end_b[0]), int(end_b[1]))
 
     def generate(self) -> None:
-        """Create a new maze in `self.grid` and set start/end."""
+        """Create a new maze in `self.walls` and set start/end."""
         start_r, start_c = 0, 0  # Always start maze generation from top-left
         self._carve_passage(start_r, start_c)
 
@@ -150,101 +242,176 @@ class MazeGenerator:
     # ---------------------------------------------------------------------
     #  DRAWING WITH TURTLE
     # ---------------------------------------------------------------------
-    def _draw_line(self, t: turtle.Turtle, x1: float, y1: float, x2: float, y2: float):
-        t.penup()
-        t.goto(x1, y1)
-        t.pendown()
-        t.goto(x2, y2)
-
-    def draw(self) -> None:
-        """Generate (if necessary) and draw the maze in a Turtle window."""
+    def _grid_lines(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(horiz, vert)`` wall masks along the grid lines.
+
+        ``horiz[i, c]`` is the wall on horizontal grid line ``i`` above cell
+        column ``c`` (``rows + 1`` lines, the last one being the southern
+        border); ``vert[r, j]`` likewise for vertical grid line ``j``.
+        """
+        rows, cols = self.rows, self.cols
+        horiz = np.zeros((rows + 1, cols), dtype=bool)
+        horiz[:rows] = (self.walls & N_BIT) != 0
+        horiz[rows] = (self.walls[-1] & S_BIT) != 0
+        vert = np.zeros((rows, cols + 1), dtype=bool)
+        vert[:, :cols] = (self.walls & W_BIT) != 0
+        vert[:, cols] = (self.walls[:, -1] & E_BIT) != 0
+        return horiz, vert
+
+    @staticmethod
+    def _runs(lines: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Find runs of consecutive ``True`` along each row of *lines*.
+
+        Returns ``(line, first, stop)`` index arrays, one entry per run.
+        """
+        padded = np.zeros((lines.shape[0], lines.shape[1] + 2), dtype=np.int8)
+        padded[:, 1:-1] = lines
+        edges = np.diff(padded, axis=1)
+        line, first = np.nonzero(edges == 1)
+        _, stop = np.nonzero(edges == -1)
+        return line, first, stop
+
+    def _wall_segments(self, offset_x: float, offset_y: float) -> np.ndarray:
+        """Return an ``(n, 4)`` array of ``x1, y1, x2, y2`` turtle coordinates.
+
+        Adjacent walls on the same grid line are merged into one segment.
+        """
+        cs = self.cell_size
+        # Grid line coordinates, computed once per row/column
+        xs = offset_x + np.arange(self.cols + 1) * cs
+        ys = offset_y - np.arange(self.rows + 1) * cs
+        horiz, vert = self._grid_lines()
+
+        h_line, h_first, h_stop = self._runs(horiz)
+        v_line, v_first, v_stop = self._runs(vert.T)
+        segments = np.empty((len(h_line) + len(v_line), 4))
+        n = len(h_line)
+        segments[:n, 0] = xs[h_first]
+        segments[:n, 1] = ys[h_line]
+        segments[:n, 2] = xs[h_stop]
+        segments[:n, 3] = ys[h_line]
+        segments[n:, 0] = xs[v_line]
+        segments[n:, 1] = ys[v_first]
+        segments[n:, 2] = xs[v_line]
+        segments[n:, 3] = ys[v_stop]
+        return segments
+
+    def _wall_mask(self, cell_px: int, thickness: int = 2) -> np.ndarray:
+        """Rasterise the walls into a boolean image, ``True`` on wall pixels.
+
+        The image is ``rows * cell_px + thickness`` by ``cols * cell_px +
+        thickness`` pixels; the wall between grid lines ``i`` and ``i + 1``
+        starts at pixel ``i * cell_px`` and is *thickness* pixels wide.
+        """
+        rows, cols = self.rows, self.cols
+        horiz, vert = self._grid_lines()
+
+        mask = np.zeros((rows * cell_px + 1, cols * cell_px + 1), dtype=bool)
+        # Each wall covers cell_px pixels plus the corner pixel it ends on
+        h_pix = mask[::cell_px]
+        h_pix[:, :-1] |= np.repeat(horiz, cell_px, axis=1)
+        h_pix[:, cell_px::cell_px] |= horiz
+        v_pix = mask[:, ::cell_px]
+        v_pix[:-1] |= np.repeat(vert, cell_px, axis=0)
+        v_pix[cell_px::cell_px] |= vert
+
+        # Thicken the one-pixel lines towards the bottom/right
+        out = np.zeros((mask.shape[0] + thickness - 1, mask.shape[1] + thickness - 1), dtype=bool)
+        for dy in range(thickness):
+            for dx in range(thickness):
+                out[dy : dy + mask.shape[0], dx : dx + mask.shape[1]] |= mask
+        return out
+
+    def draw(self, *, raster: bool = True) -> None:
+        """Generate (if necessary) and draw the maze in a Turtle window.
+
+        With *raster* (the default) the walls are blitted as one image;
+        otherwise each straight run of walls becomes its own canvas line.
+        """
 
         if self.start is None or self.end is None:
             self.generate()
 
-        # Turtle setup ----------------------------------------------------
-        t = turtle.Turtle()
-        t.hideturtle()
-        t.speed(0)
-        t.pensize(2)
-        screen = turtle.Screen()
-        screen.tracer(False)  # fast drawing
+        # Screen setup --------------------------------------------------
+        # All drawing goes straight to the Tk canvas behind the turtle screen;
+        # the handle is looked up once and kept for later draws.
+        if self._canvas is None:
+            self._canvas = turtle.Screen().getcanvas()
+        canvas = self._canvas
 
         offset_x = -self.cols * self.cell_size / 2
         offset_y = self.rows * self.cell_size / 2
 
-        # Draw outer border ----------------------------------------------
-        self._draw_line(
-            t,
-            offset_x,
-            offset_y,
-            offset_x + self.cols * self.cell_size,
-            offset_y,
-        )  # top
-        self._draw_line(
-            t,
-            offset_x,
-            offset_y - self.rows * self.cell_size,
-            offset_x + self.cols * self.cell_size,
-            offset_y - self.rows * self.cell_size,
-        )  # bottom
-        self._draw_line(
-            t,
-            offset_x,
-            offset_y,
-            offset_x,
-            offset_y - self.rows * self.cell_size,
-        )  # left
-        self._draw_line(
-            t,
-            offset_x + self.cols * self.cell_size,
-            offset_y,
-            offset_x + self.cols * self.cell_size,
-            offset_y - self.rows * self.cell_size,
-        )  # right
-
-        # Draw internal walls --------------------------------------------
-        for r in range(self.rows):
-            for c in range(self.cols):
-                x = offset_x + c * self.cell_size
-                y = offset_y - r * self.cell_size
-                cell = self.grid[r][c]
-
-                if cell[N]:
-                    self._draw_line(t, x, y, x + self.cell_size, y)
-                if cell[W]:
-                    self._draw_line(t, x, y, x, y - self.cell_size)
-                # Draw southern & eastern walls for bottom/last column cells only
-                if r == self.rows - 1 and cell[S]:
-                    self._draw_line(
-                        t, x, y - self.cell_size, x + self.cell_size, y - self.cell_size
-                    )
-                if c == self.cols - 1 and cell[E]:
-                    self._draw_line(
-                        t, x + self.cell_size, y, x + self.cell_size, y - self.cell_size
-                    )
+        # Draw walls ------------------------------------------------------
+        # Tk's y axis points down, hence the sign flips.
+        if raster:
+            # The whole wall layout is rasterised once and blitted as a single
+            # image; the -1 centres the 2px walls on the grid lines.
+            mask = self._wall_mask(self.cell_size, thickness=2)
+            pixels = np.where(mask, 0, 255).astype(np.uint8)
+            height, width = pixels.shape
+            ppm = b"P6 %d %d 255\n" % (width, height) + np.repeat(pixels, 3).tobytes()
+            # Keep a reference: Tk drops the image once the Python object is gone
+            self._wall_image = tkinter.PhotoImage(master=canvas, data=ppm, format="PPM")
+            canvas.create_image(
+                offset_x - 1, -offset_y - 1, image=self._wall_image, anchor="nw"
+            )
+        else:
+            segments = self._wall_segments(offset_x, offset_y)
+            segments[:, 1::2] *= -1
+            for coords in segments.tolist():
+                canvas.create_line(*coords, fill="black", width=2, capstyle="round")
 
         # Mark entrance and exit -----------------------------------------
         def mark_cell(rc: Tuple[int, int], colour: str):
             rr, cc = rc
-            cx = offset_x + cc * self.cell_size + self.cell_size / 2
-            cy = offset_y - rr * self.cell_size - self.cell_size / 2
-            t.penup()
-            t.goto(cx, cy - self.cell_size / 4)
-            t.pendown()
-            t.color(colour)
-            t.begin_fill()
-            for _ in range(4):
-                t.forward(self.cell_size / 2)
-                t.left(90)
-            t.end_fill()
-            t.color("black")
+            half = self.cell_size / 2
+            x = offset_x + cc * self.cell_size + half
+            y = offset_y - rr * self.cell_size - half
+            quarter = self.cell_size / 4
+            canvas.create_polygon(
+                x, -(y - quarter),
+                x + half, -(y - quarter),
+                x + half, -(y + quarter),
+                x, -(y + quarter),
+                fill=colour,
+                outline=colour,
+                width=2,
+            )
 
         mark_cell(self.start, "green")
         mark_cell(self.end, "red")
 
-        screen.tracer(True)
-        screen.mainloop()
+        canvas.update_idletasks()  # flush everything in one go
+        turtle.mainloop()
+
+    # ---------------------------------------------------------------------
+    #  HEADLESS RENDERING
+    # ---------------------------------------------------------------------
+    def render_png(self, path: str, px_per_cell: int = 12) -> None:
+        """Generate (if necessary) and save the maze as a PNG, without Tk.
+
+        Walls are rasterised straight from the bitmask, so this also works
+        where no display is available. Requires Pillow.
+        """
+        from PIL import Image
+
+        if self.start is None or self.end is None:
+            self.generate()
+
+        mask = self._wall_mask(px_per_cell, thickness=2)
+        img = np.full(mask.shape + (3,), 255, dtype=np.uint8)
+        img[mask] = 0
+
+        # Entrance and exit: same half-cell squares as draw(). Pixel 0 sits one
+        # pixel before grid line 0 (cf. the ``- 1`` in draw()'s create_image)
+        half, quarter = px_per_cell // 2, px_per_cell // 4
+        for (rr, cc), colour in ((self.start, (0, 128, 0)), (self.end, (255, 0, 0))):
+            x = cc * px_per_cell + half + 1
+            y = rr * px_per_cell + half + 1
+            img[y - quarter : y + quarter + 1, x : x + half + 1] = colour
+
+        Image.fromarray(img).save(path)
 
 
 # -------------------------------------------------------------------------
@@ -261,4 +428,8 @@ if __name__ == "__main__":
         complexity=0.75,
         difficulty=0.9,
     )
-    maze.draw()
+    if len(sys.argv) > 1:
+        # Headless: `python turtle_maze.py maze.png` writes the maze to a file
+        maze.render_png(sys.argv[1])
+    else:
+        maze.draw()